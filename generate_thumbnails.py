@@ -5,6 +5,7 @@ Generate story thumbnail images using DALL-E 3.
 Usage:
     python generate_thumbnails.py "小红帽" "A little girl in a red hood..."
     python generate_thumbnails.py --batch prompts.json
+    python generate_thumbnails.py --batch prompts.json --workers 5
     python generate_thumbnails.py --list
 
 The --batch flag reads a JSON file mapping story names to DALL-E prompts:
@@ -13,6 +14,9 @@ The --batch flag reads a JSON file mapping story names to DALL-E prompts:
         "白雪公主": "A beautiful princess..."
     }
 
+Batch prompts are generated concurrently (--workers, default 5); rate-limited
+requests are retried with exponential backoff.
+
 Requires: OPENAI_API_KEY env var
 """
 
@@ -20,12 +24,18 @@ import io
 import json
 import os
 import sys
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 import requests
-from openai import OpenAI
+from openai import OpenAI, RateLimitError
 from PIL import Image
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used otherwise
+    orjson = None
 
 BASE_DIR = Path(__file__).parent
 IMAGES_DIR = BASE_DIR / "images"
@@ -40,6 +50,11 @@ STYLE_SUFFIX = (
     "No text, no words, no letters anywhere in the image."
 )
 
+DEFAULT_WORKERS = 5
+
+# Shared across batch workers so image downloads reuse pooled TLS connections
+http = requests.Session()
+
 
 def get_openai_client():
     api_key = os.environ.get("OPENAI_API_KEY")
@@ -49,6 +64,12 @@ def get_openai_client():
     return OpenAI(api_key=api_key)
 
 
+@retry(
+    retry=retry_if_exception_type(RateLimitError),
+    wait=wait_random_exponential(min=2, max=60),
+    stop=stop_after_attempt(6),
+    reraise=True,
+)
 def generate_image(client, story_name: str, prompt: str, overwrite=False):
     IMAGES_DIR.mkdir(exist_ok=True)
     output_path = IMAGES_DIR / f"{story_name}.png"
@@ -69,10 +90,18 @@ def generate_image(client, story_name: str, prompt: str, overwrite=False):
     )
 
     image_url = response.data[0].url
-    img_response = requests.get(image_url)
-    img = Image.open(io.BytesIO(img_response.content))
-    img = img.resize((1600, 900), Image.Resampling.LANCZOS)
-    img.save(output_path, "PNG")
+    r = http.get(image_url, timeout=60)
+    r.raise_for_status()
+    img = Image.open(io.BytesIO(r.content))
+    # 1792x1024 is slightly taller than 16:9; crop rather than resample
+    w, h = img.size
+    top = (h - w * 9 // 16) // 2
+    if top > 0:
+        img = img.crop((0, top, w, h - top))
+    # Save under a temporary name so an interrupted write is never mistaken for a finished image
+    part = output_path.with_name(output_path.name + ".part")
+    img.save(part, "PNG")
+    os.replace(part, output_path)
     print(f"  Saved: {output_path.name}")
     return output_path
 
@@ -92,22 +121,43 @@ def main():
         return
 
     if sys.argv[1] == "--batch":
-        prompts_file = Path(sys.argv[2]) if len(sys.argv) > 2 else BASE_DIR / "prompts.json"
+        has_file = len(sys.argv) > 2 and not sys.argv[2].startswith("--")
+        prompts_file = Path(sys.argv[2]) if has_file else BASE_DIR / "prompts.json"
         if not prompts_file.exists():
             print(f"Prompts file not found: {prompts_file}")
             return
-        with open(prompts_file, "r", encoding="utf-8") as f:
-            prompts = json.load(f)
+        data = prompts_file.read_bytes()
+        prompts = orjson.loads(data) if orjson else json.loads(data)
 
         overwrite = "--overwrite" in sys.argv
-        print(f"Generating {len(prompts)} thumbnails...")
-        for i, (name, prompt) in enumerate(prompts.items(), 1):
-            print(f"\n[{i}/{len(prompts)}]")
+        workers = DEFAULT_WORKERS
+        if "--workers" in sys.argv:
+            idx = sys.argv.index("--workers")
             try:
-                generate_image(client, name, prompt, overwrite=overwrite)
-                time.sleep(2)
-            except Exception as e:
-                print(f"  Error: {e}")
+                workers = int(sys.argv[idx + 1])
+            except (IndexError, ValueError):
+                workers = 0
+            if workers < 1:
+                print("Usage: --workers N  (N must be a positive integer)")
+                return
+
+        print(f"Generating {len(prompts)} thumbnails ({workers} workers)...")
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = {
+                executor.submit(generate_image, client, name, prompt, overwrite): name
+                for name, prompt in prompts.items()
+            }
+            for i, future in enumerate(as_completed(futures), 1):
+                name = futures[future]
+                try:
+                    future.result()
+                    print(f"[{i}/{len(prompts)}] {name} done")
+                except Exception as e:
+                    print(f"[{i}/{len(prompts)}] {name} — Error: {e}")
+        finally:
+            # On Ctrl-C, don't go on to generate the prompts still queued
+            executor.shutdown(cancel_futures=True)
         return
 
     # Single image mode: generate_thumbnails.py "name" "prompt"
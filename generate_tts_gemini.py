@@ -9,29 +9,36 @@ Usage:
     python generate_tts_gemini.py <story_file.md>                # Single story
     python generate_tts_gemini.py <story_file.md> Zephyr         # Custom voice
     python generate_tts_gemini.py --pattern "格林童话-*.md"       # Batch by glob
+    python generate_tts_gemini.py --pattern "*.md" --workers 2   # Concurrent batch
 
 Requires: GEMINI_API_KEY env var
 """
 
 import os
 import sys
-import time
 import struct
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from google import genai
-from google.genai import types
+from google.genai import errors, types
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
 
 STORIES_DIR = Path(__file__).parent / "stories"
 NARRATIONS_DIR = Path(__file__).parent / "narrations"
 
+DEFAULT_WORKERS = 2  # Gemini TTS quota is tight; keep batch concurrency low
+
 
 def clean_story_text(filepath):
+    # Drop a leading "# Title" line without splitting/re-joining the whole story
     with open(filepath, "r", encoding="utf-8") as f:
-        text = f.read()
-    lines = text.strip().split("\n")
-    if lines and lines[0].startswith("#"):
-        lines = lines[1:]
-    return "\n".join(lines).strip()
+        first = f.readline()
+        while first and not first.strip():
+            first = f.readline()
+        rest = f.read()
+    if first.lstrip().startswith("#"):
+        return rest.strip()
+    return (first + rest).strip()
 
 
 def parse_audio_mime_type(mime_type: str) -> dict:
@@ -52,17 +59,16 @@ def parse_audio_mime_type(mime_type: str) -> dict:
     return {"bits_per_sample": bits_per_sample, "rate": rate}
 
 
-def convert_to_wav(audio_data: bytes, mime_type: str) -> bytes:
+def wav_header(data_len: int, mime_type: str) -> bytes:
     p = parse_audio_mime_type(mime_type)
     bits = p["bits_per_sample"]
     rate = p["rate"]
     bps = bits // 8
-    header = struct.pack(
+    return struct.pack(
         "<4sI4s4sIHHIIHH4sI",
-        b"RIFF", 36 + len(audio_data), b"WAVE", b"fmt ", 16,
-        1, 1, rate, rate * bps, bps, bits, b"data", len(audio_data),
+        b"RIFF", 36 + data_len, b"WAVE", b"fmt ", 16,
+        1, 1, rate, rate * bps, bps, bits, b"data", data_len,
     )
-    return header + audio_data
 
 
 def get_gemini_client():
@@ -73,7 +79,17 @@ def get_gemini_client():
     return genai.Client(api_key=api_key)
 
 
-def generate_narration(story_file, voice="Zephyr", output_filename=None):
+def is_rate_limited(e):
+    return isinstance(e, errors.APIError) and e.code == 429
+
+
+@retry(
+    retry=retry_if_exception(is_rate_limited),
+    wait=wait_random_exponential(min=5, max=120),
+    stop=stop_after_attempt(6),
+    reraise=True,
+)
+def generate_narration(client, story_file, voice="Zephyr", output_filename=None):
     story_path = STORIES_DIR / story_file
     out_name = output_filename or story_file.replace(".md", ".wav")
     output_path = NARRATIONS_DIR / out_name
@@ -85,8 +101,7 @@ def generate_narration(story_file, voice="Zephyr", output_filename=None):
     text = clean_story_text(story_path)
     print(f"  {story_file} ({len(text)} chars)")
 
-    client = get_gemini_client()
-    print(f"  Generating TTS (Gemini, voice={voice})...")
+    print(f"  {story_file}: generating TTS (Gemini, voice={voice})...")
 
     contents = [
         types.Content(
@@ -104,28 +119,33 @@ def generate_narration(story_file, voice="Zephyr", output_filename=None):
         ),
     )
 
-    audio_chunks = []
-    for chunk in client.models.generate_content_stream(
-        model="gemini-2.5-pro-preview-tts",
-        contents=contents,
-        config=config,
-    ):
-        if chunk.candidates and chunk.candidates[0].content and chunk.candidates[0].content.parts:
-            part = chunk.candidates[0].content.parts[0]
-            if part.inline_data and part.inline_data.data:
-                audio_chunks.append((part.inline_data.data, part.inline_data.mime_type))
-
-    if not audio_chunks:
-        print("  No audio data received")
+    # Stream PCM straight to disk behind a placeholder header, then patch in the length
+    mime, data_len = None, 0
+    try:
+        with open(output_path, "wb") as f:
+            f.write(wav_header(0, "audio/L16;rate=24000"))
+            for chunk in client.models.generate_content_stream(
+                model="gemini-2.5-pro-preview-tts",
+                contents=contents,
+                config=config,
+            ):
+                if chunk.candidates and chunk.candidates[0].content and chunk.candidates[0].content.parts:
+                    part = chunk.candidates[0].content.parts[0]
+                    if part.inline_data and part.inline_data.data:
+                        f.write(part.inline_data.data)
+                        data_len += len(part.inline_data.data)
+                        mime = mime or part.inline_data.mime_type
+            f.seek(0)
+            f.write(wav_header(data_len, mime or "audio/L16;rate=24000"))
+    except BaseException:
+        output_path.unlink(missing_ok=True)
+        raise
+
+    if not data_len:
+        output_path.unlink()
+        print(f"  {story_file}: no audio data received")
         return None
 
-    all_audio = b"".join(c[0] for c in audio_chunks)
-    mime = audio_chunks[0][1] if audio_chunks else "audio/L16;rate=24000"
-    wav_data = convert_to_wav(all_audio, mime)
-
-    with open(output_path, "wb") as f:
-        f.write(wav_data)
-
     print(f"  Saved: {output_path}")
     return output_path
 
@@ -138,26 +158,48 @@ def main():
         return
 
     arg = sys.argv[1]
+    client = get_gemini_client()
 
     if arg == "--pattern":
-        pattern = sys.argv[2] if len(sys.argv) > 2 else "*.md"
+        pattern = sys.argv[2] if len(sys.argv) > 2 and not sys.argv[2].startswith("--") else "*.md"
+        workers = DEFAULT_WORKERS
+        if "--workers" in sys.argv:
+            idx = sys.argv.index("--workers")
+            try:
+                workers = int(sys.argv[idx + 1])
+            except (IndexError, ValueError):
+                workers = 0
+            if workers < 1:
+                print("Usage: --workers N  (N must be a positive integer)")
+                return
+
         stories = sorted(f.name for f in STORIES_DIR.glob(pattern))
         print(f"Generating narrations for {len(stories)} stories (pattern: {pattern})")
-        for i, name in enumerate(stories, 1):
-            out = NARRATIONS_DIR / name.replace(".md", ".wav")
-            if out.exists():
-                print(f"\n[{i}/{len(stories)}] {name} — exists, skipping")
-                continue
-            print(f"\n[{i}/{len(stories)}]")
-            try:
-                generate_narration(name)
-                if i < len(stories):
-                    time.sleep(5)
-            except Exception as e:
-                print(f"  Error: {e}")
+        pending = []
+        for name in stories:
+            if (NARRATIONS_DIR / name.replace(".md", ".wav")).exists():
+                print(f"  {name} — exists, skipping")
+            else:
+                pending.append(name)
+
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = {executor.submit(generate_narration, client, name): name for name in pending}
+            for i, future in enumerate(as_completed(futures), 1):
+                name = futures[future]
+                try:
+                    if future.result():
+                        print(f"[{i}/{len(pending)}] {name} done")
+                    else:
+                        print(f"[{i}/{len(pending)}] {name} — failed")
+                except Exception as e:
+                    print(f"[{i}/{len(pending)}] {name} — Error: {e}")
+        finally:
+            # On Ctrl-C, don't go on to narrate the stories still queued
+            executor.shutdown(cancel_futures=True)
     else:
         voice = sys.argv[2] if len(sys.argv) > 2 else "Zephyr"
-        generate_narration(arg, voice=voice)
+        generate_narration(client, arg, voice=voice)
 
 
 if __name__ == "__main__":
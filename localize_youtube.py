@@ -20,21 +20,29 @@ import os
 import pickle
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 from google import genai
-from google.genai import types
+from google.genai import errors, types
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used otherwise
+    orjson = None
 
 BASE_DIR = Path(__file__).parent
 CLIENT_SECRETS = BASE_DIR / "client_secrets.json"
 TOKEN_FILE = BASE_DIR / "youtube_token.pickle"
 CACHE_FILE = BASE_DIR / "localization_cache.json"
 SCOPES = ["https://www.googleapis.com/auth/youtube"]
+GEMINI_WORKERS = 8
 
 
 def get_youtube_service():
@@ -50,7 +58,9 @@ def get_youtube_service():
             credentials = flow.run_local_server(port=0, open_browser=True)
         with open(TOKEN_FILE, "wb") as f:
             pickle.dump(credentials, f)
-    return build("youtube", "v3", credentials=credentials)
+    # Bundled discovery document (already the default in google-api-python-client
+    # 2.x); spelled out so build() never falls back to a fetch or file cache
+    return build("youtube", "v3", credentials=credentials, static_discovery=True, cache_discovery=False)
 
 
 def get_gemini_client():
@@ -61,23 +71,37 @@ def get_gemini_client():
     return genai.Client(api_key=api_key)
 
 
+def json_loads(data):
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
 def load_cache():
     if CACHE_FILE.exists():
-        with open(CACHE_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return json_loads(CACHE_FILE.read_bytes())
     return {}
 
 
 def save_cache(cache):
-    with open(CACHE_FILE, "w", encoding="utf-8") as f:
-        json.dump(cache, f, ensure_ascii=False, indent=2)
+    if orjson:
+        data = orjson.dumps(cache, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(cache, ensure_ascii=False, indent=2).encode("utf-8")
+    tmp = CACHE_FILE.with_suffix(".json.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, CACHE_FILE)
 
 
-def get_channel_videos(youtube, max_results=500):
+def get_uploads_playlist_id(youtube):
     resp = youtube.channels().list(part="contentDetails", mine=True).execute()
     if not resp.get("items"):
+        return None
+    return resp["items"][0]["contentDetails"]["relatedPlaylists"]["uploads"]
+
+
+def get_channel_videos(youtube, max_results=500):
+    uploads_id = get_uploads_playlist_id(youtube)
+    if not uploads_id:
         return []
-    uploads_id = resp["items"][0]["contentDetails"]["relatedPlaylists"]["uploads"]
 
     videos, next_page = [], None
     while len(videos) < max_results:
@@ -96,21 +120,41 @@ def get_channel_videos(youtube, max_results=500):
     return videos
 
 
-def get_video_localizations(youtube, video_id):
-    try:
-        resp = youtube.videos().list(part="localizations,snippet", id=video_id).execute()
-        if resp.get("items"):
-            item = resp["items"][0]
-            return {
+def get_video_localizations_bulk(youtube, video_ids):
+    """Fetch localizations for many videos, 50 comma-joined IDs per videos.list call.
+
+    IDs in a batch whose request failed are missing from the result, so callers
+    can tell "unknown" apart from "has no localizations".
+    """
+    result = {}
+    for i in range(0, len(video_ids), 50):
+        batch = video_ids[i:i + 50]
+        try:
+            resp = youtube.videos().list(part="localizations,snippet", id=",".join(batch)).execute()
+        except HttpError as e:
+            print(f"  Could not fetch localizations for {len(batch)} video(s): {e}")
+            continue
+        for item in resp.get("items", []):
+            result[item["id"]] = {
                 "localizations": item.get("localizations", {}),
                 "title": item["snippet"]["title"],
                 "description": item["snippet"]["description"],
             }
-    except HttpError:
-        pass
-    return None
+    return result
 
 
+def is_rate_limited(e):
+    return isinstance(e, errors.APIError) and e.code == 429
+
+
+# Eight concurrent translations can trip Gemini's per-minute limit; back off
+# instead of failing the video
+@retry(
+    retry=retry_if_exception(is_rate_limited),
+    wait=wait_random_exponential(min=5, max=120),
+    stop=stop_after_attempt(6),
+    reraise=True,
+)
 def generate_english_metadata(gemini_client, chinese_title):
     prompt = f"""Translate this Chinese children's story YouTube title to an SEO-optimized English title.
 
@@ -131,7 +175,7 @@ Return JSON: {{"english_title": "...", "story_name_english": "..."}}"""
     )
 
     try:
-        result = json.loads(resp.text)
+        result = json_loads(resp.text)
         if isinstance(result, list):
             result = result[0]
         en_title = result.get("english_title", "")
@@ -148,16 +192,21 @@ Return JSON: {{"english_title": "...", "story_name_english": "..."}}"""
         return None
 
 
-def update_localizations(youtube, video_id, localizations):
+def update_localizations(youtube, video_id, localizations, existing=None):
+    """Merge localizations into a video's existing ones.
+
+    Pass `existing` when the current localizations were already fetched
+    (e.g. via get_video_localizations_bulk) to skip the extra videos.list call.
+    """
     try:
-        current = youtube.videos().list(part="snippet,localizations", id=video_id).execute()
-        if not current.get("items"):
-            return False
-        existing = current["items"][0].get("localizations", {})
-        existing.update(localizations)
+        if existing is None:
+            current = youtube.videos().list(part="snippet,localizations", id=video_id).execute()
+            if not current.get("items"):
+                return False
+            existing = current["items"][0].get("localizations", {})
         youtube.videos().update(
             part="localizations",
-            body={"id": video_id, "localizations": existing},
+            body={"id": video_id, "localizations": {**existing, **localizations}},
         ).execute()
         return True
     except HttpError as e:
@@ -167,31 +216,62 @@ def update_localizations(youtube, video_id, localizations):
 
 def cmd_list(youtube):
     videos = get_channel_videos(youtube)
+    locs = get_video_localizations_bulk(youtube, [v["id"] for v in videos])
     for i, v in enumerate(videos, 1):
-        loc = get_video_localizations(youtube, v["id"])
-        has_en = "en" in loc.get("localizations", {}) if loc else False
-        status = "EN" if has_en else "--"
+        loc = locs.get(v["id"])
+        if loc is None:
+            status = "??"
+        else:
+            status = "EN" if "en" in loc.get("localizations", {}) else "--"
         print(f"  {i:3}. [{status}] {v['title'][:60]}  ({v['id']})")
 
 
 def cmd_localize_all(youtube, gemini, dry_run=False):
     videos = get_channel_videos(youtube)
+    locs = get_video_localizations_bulk(youtube, [v["id"] for v in videos])
     cache = load_cache()
-    updated = skipped = failed = 0
-
-    for i, v in enumerate(videos, 1):
-        print(f"\n[{i}/{len(videos)}] {v['title'][:50]}")
-        loc = get_video_localizations(youtube, v["id"])
-        if loc and "en" in loc.get("localizations", {}):
-            print("  Already localized, skipping")
-            skipped += 1
-            continue
-
-        en = cache.get(v["id"]) or generate_english_metadata(gemini, v["title"])
-        if en:
-            cache[v["id"]] = en
+    updated = failed = 0
+
+    # Videos whose lookup failed are left out: retranslating them could
+    # overwrite an English localization we simply couldn't see.
+    unknown = [v for v in videos if v["id"] not in locs]
+    todo = [v for v in videos if v["id"] in locs and "en" not in locs[v["id"]]["localizations"]]
+    skipped = len(videos) - len(todo) - len(unknown)
+    print(f"{skipped} of {len(videos)} video(s) already localized, {len(todo)} to do")
+    if unknown:
+        print(f"Skipping {len(unknown)} video(s) whose localizations could not be fetched")
+        failed += len(unknown)
+
+    # Phase 1: Gemini translations are independent network calls, run them concurrently
+    to_translate = [v for v in todo if v["id"] not in cache]
+    if to_translate:
+        print(f"Translating {len(to_translate)} title(s) with Gemini...")
+        executor = ThreadPoolExecutor(max_workers=GEMINI_WORKERS)
+        try:
+            futures = {
+                executor.submit(generate_english_metadata, gemini, v["title"]): v
+                for v in to_translate
+            }
+            for future in as_completed(futures):
+                v = futures[future]
+                try:
+                    en = future.result()
+                except Exception as e:
+                    print(f"  Gemini failed for {v['id']}: {e}")
+                    continue
+                if en:
+                    cache[v["id"]] = en
+        finally:
+            # Persist whatever was translated even on Ctrl-C, and drop queued work
+            executor.shutdown(cancel_futures=True)
             save_cache(cache)
-        else:
+
+    # Phase 2: YouTube updates stay sequential to keep quota usage predictable
+    for i, v in enumerate(todo, 1):
+        print(f"\n[{i}/{len(todo)}] {v['title'][:50]}")
+        en = cache.get(v["id"])
+        if not en:
+            print("  No English metadata, skipping")
             failed += 1
             continue
 
@@ -199,7 +279,8 @@ def cmd_localize_all(youtube, gemini, dry_run=False):
         if dry_run:
             continue
 
-        if update_localizations(youtube, v["id"], {"en": en}):
+        existing = locs[v["id"]]["localizations"]
+        if update_localizations(youtube, v["id"], {"en": en}, existing=existing):
             updated += 1
         else:
             failed += 1
@@ -7,6 +7,9 @@ End-to-end pipeline that turns a markdown story into a narrated video:
   2. Mix narration with background music (ffmpeg)
   3. Create video from thumbnail image + mixed audio (ffmpeg)
 
+The full pipeline fuses steps 2 and 3 into a single ffmpeg pass and skips
+writing mixed/<story>.mp3; pass --keep-intermediate to run them separately.
+
 Usage:
     python pipeline.py --list                    # List available stories
     python pipeline.py --status                  # Show pipeline status
@@ -15,20 +18,34 @@ Usage:
     python pipeline.py --step2 [story_name]      # Mix audio only
     python pipeline.py --step3 [story_name]      # Create video only
     python pipeline.py --all                     # Run full pipeline for all stories
+    python pipeline.py --all --keep-intermediate # Also write mixed/ audio
 
 Requires: OPENAI_API_KEY env var, ffmpeg/ffprobe installed
 """
 
+import functools
+import hashlib
+import json
+import mmap
 import os
 import re
 import shutil
 import sys
 import time
 import subprocess
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from openai import OpenAI
+from openai import APIConnectionError, InternalServerError, OpenAI, RateLimitError
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
 from generate_thumbnails import generate_image
 
+try:
+    from mutagen.mp3 import MP3
+except ImportError:  # fall back to ffprobe for durations
+    MP3 = None
+
 BASE_DIR = Path(__file__).parent
 STORIES_DIR = BASE_DIR / "stories"
 IMAGES_DIR = BASE_DIR / "images"
@@ -36,14 +53,54 @@ NARRATIONS_DIR = BASE_DIR / "narrations"
 MIXED_DIR = BASE_DIR / "mixed"
 OUTPUT_DIR = BASE_DIR / "videos"
 TEMP_DIR = BASE_DIR / "temp"
+TTS_CACHE_DIR = TEMP_DIR / "tts_cache"
 
 BACKGROUND_MUSIC = BASE_DIR / "background" / "background.m4a"
 
 TTS_MODEL = "tts-1"
 TTS_VOICE = "alloy"
+TTS_RPM = 50  # requests per minute allowed for the TTS model on this key
+TTS_CHUNK_WORKERS = 4  # concurrent chunk requests within one story
 NARRATION_DB = 5
 MUSIC_DB = -15
 
+VIDEO_FILTER = (
+    "scale=1920:1080:force_original_aspect_ratio=decrease,"
+    "pad=1920:1080:(ow-iw)/2:(oh-ih)/2"
+)
+
+# A single still image: feed it at 1 fps and encode with a fast preset on all
+# cores. A long GOP (one keyframe every 5 minutes) keeps the near-empty
+# P-frames doing the work, so files stay small.
+STILL_IMAGE_INPUT = ["-framerate", "1", "-loop", "1"]
+STILL_VIDEO_CODEC = [
+    "-c:v", "libx264", "-preset", "veryfast", "-tune", "stillimage",
+    "-threads", "0", "-g", "300", "-pix_fmt", "yuv420p",
+]
+
+# Steps 1 and thumbnails wait on the OpenAI API; steps 2/3 are ffmpeg jobs
+# that already use several threads each. Each worker thread just waits on its
+# own ffmpeg process, so no process pool is needed to run them in parallel.
+API_WORKERS = 8
+FFMPEG_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+
+# A .part output not written to for this long is left over from a crashed run
+PART_STALE_SECONDS = 60 * 60
+
+_HEADING_RE = re.compile(r"^#+ .*$", re.MULTILINE)
+_BOLD_RE = re.compile(r"\*\*")
+_BLANK_RE = re.compile(r"\n{3,}")
+_TITLE_RE = re.compile(r"^#+\s*\**\s*(.+?)\s*\**\s*$")
+
+_print_lock = threading.Lock()
+_ffmpeg_slots = threading.BoundedSemaphore(FFMPEG_WORKERS)
+
+
+def log(msg):
+    """print() that keeps lines from concurrent workers from interleaving."""
+    with _print_lock:
+        print(msg, flush=True)
+
 
 def get_openai_client():
     api_key = os.environ.get("OPENAI_API_KEY")
@@ -53,27 +110,104 @@ def get_openai_client():
     return OpenAI(api_key=api_key)
 
 
-def clean_story_text(filepath):
-    """Strip markdown formatting from a story file."""
-    with open(filepath, "r", encoding="utf-8") as f:
-        text = f.read()
-    text = re.sub(r"^#+ .*$", "", text, flags=re.MULTILINE)
-    text = re.sub(r"\*\*", "", text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
-    return text.strip()
+@functools.lru_cache(maxsize=None)
+def load_story(story_name):
+    """Read a story once and return (title, text stripped of markdown).
+
+    The title is the first markdown heading, or the story name if there is none.
+    The file is memory-mapped: the title scan only decodes heading lines, and
+    the text is decoded straight from the mapping without an extra bytes copy.
+    """
+    title, text = story_name, ""
+    with open(STORIES_DIR / f"{story_name}.md", "rb") as f:
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                pos, size = 0, len(mm)
+                while pos < size:
+                    end = mm.find(b"\n", pos)
+                    end = size if end == -1 else end
+                    if mm[pos:pos + 1] == b"#":
+                        m = _TITLE_RE.match(mm[pos:end].decode("utf-8").rstrip("\r"))
+                        if m:
+                            title = m.group(1)
+                            break
+                    pos = end + 1
+                text = str(mm, "utf-8")
+
+    text = text.replace("\r\n", "\n")
+    text = _HEADING_RE.sub("", text)
+    text = _BOLD_RE.sub("", text)
+    text = _BLANK_RE.sub("\n\n", text)
+    return title, text.strip()
+
+
+def part_path(path):
+    """Temporary name an output is written to before being renamed into place."""
+    return path.with_name(path.name + ".part")
+
+
+def remove_partial_outputs():
+    """Delete .part files left behind by an interrupted run.
+
+    Only files untouched for PART_STALE_SECONDS are removed, so outputs that
+    another pipeline process is still writing are left alone.
+    """
+    cutoff = time.time() - PART_STALE_SECONDS
+    for d in [IMAGES_DIR, NARRATIONS_DIR, MIXED_DIR, OUTPUT_DIR]:
+        for p in d.glob("*.part"):
+            try:
+                if p.stat().st_mtime < cutoff:
+                    p.unlink()
+            except FileNotFoundError:
+                pass  # finished (renamed) or removed by another process
+
+
+def existing_stems(directory, suffix):
+    """Names (without suffix) of the files in directory ending in suffix."""
+    if not directory.exists():
+        return set()
+    with os.scandir(directory) as entries:
+        return {e.name[:-len(suffix)] for e in entries if e.name.endswith(suffix) and e.is_file()}
 
 
-def extract_story_title(filepath):
-    """Pull the first markdown heading from a story file."""
-    with open(filepath, "r", encoding="utf-8") as f:
-        for line in f:
-            m = re.match(r"^#+\s*\**\s*(.+?)\s*\**\s*$", line)
-            if m:
-                return m.group(1)
-    return filepath.stem
+def run_stories(worker, stories, out_dir, suffix, max_workers):
+    """Run worker(story) on a thread pool for stories with no output in out_dir.
+
+    Returns (ok, fail); stories with an existing output count as ok.
+    """
+    done = existing_stems(out_dir, suffix)
+    ok = fail = 0
+    pending = []
+    for story in stories:
+        if story in done:
+            log(f"  {story} — exists, skipping")
+            ok += 1
+        else:
+            pending.append(story)
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {executor.submit(worker, story): story for story in pending}
+        for future in as_completed(futures):
+            story = futures[future]
+            try:
+                if future.result():
+                    log(f"  {story} — done")
+                    ok += 1
+                else:
+                    fail += 1
+            except Exception as e:
+                log(f"  {story} — error: {e}")
+                fail += 1
+    finally:
+        # On Ctrl-C, drop queued stories instead of running them to completion
+        executor.shutdown(cancel_futures=True)
+    return ok, fail
 
 
 def get_audio_duration(filepath):
+    if MP3 is not None:
+        return MP3(str(filepath)).info.length
     result = subprocess.run(
         [
             "ffprobe", "-v", "error",
@@ -86,76 +220,174 @@ def get_audio_duration(filepath):
     return float(result.stdout.strip())
 
 
+def run_ffmpeg(*args, stdin_files=()):
+    """Run ffmpeg with errors-only logging, optionally piping files into stdin.
+
+    Only stderr is kept (and only read for the error message), so long
+    encodes never buffer ffmpeg's progress output in memory.
+    """
+    cmd = ["ffmpeg", "-y", "-nostdin", "-loglevel", "error", *args]
+
+    def feed_stdin(proc):
+        try:
+            for p in stdin_files:
+                with open(p, "rb") as f:
+                    shutil.copyfileobj(f, proc.stdin)
+        except BrokenPipeError:
+            pass  # ffmpeg exited early; its stderr says why
+        finally:
+            try:
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass
+
+    with subprocess.Popen(
+        cmd,
+        stdin=subprocess.PIPE if stdin_files else subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    ) as proc:
+        # Feed stdin from a thread while stderr is drained here: writing it all
+        # first would deadlock if ffmpeg blocked on a full stderr pipe
+        feeder = None
+        if stdin_files:
+            feeder = threading.Thread(target=feed_stdin, args=(proc,), daemon=True)
+            feeder.start()
+        stderr = proc.stderr.read()
+        if feeder:
+            feeder.join()
+    if proc.returncode:
+        msg = stderr.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(f"ffmpeg exited with {proc.returncode}: {msg}")
+
+
 # ---------------------------------------------------------------------------
 # Step 1: TTS Narration
 # ---------------------------------------------------------------------------
 
+_tts_window = deque()
+_tts_window_lock = threading.Lock()
+_tts_backoff = wait_random_exponential(min=1, max=60)
+
+
+def wait_for_tts_slot():
+    """Block until another TTS request fits under TTS_RPM for the last 60s."""
+    while True:
+        with _tts_window_lock:
+            now = time.monotonic()
+            while _tts_window and now - _tts_window[0] >= 60:
+                _tts_window.popleft()
+            if len(_tts_window) < TTS_RPM:
+                _tts_window.append(now)
+                return
+            delay = 60 - (now - _tts_window[0])
+        time.sleep(delay)
+
+
+def tts_retry_wait(retry_state):
+    """Honor a 429 Retry-After header, else back off exponentially with jitter."""
+    e = retry_state.outcome.exception()
+    if isinstance(e, RateLimitError):
+        try:
+            return float(e.response.headers.get("retry-after", ""))
+        except ValueError:
+            pass
+    return _tts_backoff(retry_state)
+
+
+def log_tts_retry(retry_state):
+    e = retry_state.outcome.exception()
+    log(f"    TTS retry {retry_state.attempt_number} after: {str(e)[:60]}")
+
+
+@retry(
+    retry=retry_if_exception_type((RateLimitError, APIConnectionError, InternalServerError)),
+    wait=tts_retry_wait,
+    stop=stop_after_attempt(8),
+    before_sleep=log_tts_retry,
+    reraise=True,
+)
+def synthesize_chunk(client, text, voice, path):
+    wait_for_tts_slot()
+    # Disable the SDK's own retries: they would bypass the RPM window and
+    # multiply the attempts made under the tenacity policy above.
+    response = client.with_options(max_retries=0).audio.speech.create(
+        model=TTS_MODEL, voice=voice,
+        input=text, response_format="mp3",
+    )
+    response.stream_to_file(str(path))
+
+
+def tts_cache_path(text, voice):
+    """Content-addressed location of the synthesized audio for one chunk."""
+    key = hashlib.sha256(f"{TTS_MODEL}|{voice}|{text}".encode("utf-8")).hexdigest()
+    return TTS_CACHE_DIR / key[:2] / f"{key}.mp3"
+
+
+def get_chunk_audio(client, text, voice, temp_path):
+    """Return the cached audio for a chunk, synthesizing it on a cache miss."""
+    cached = tts_cache_path(text, voice)
+    if cached.exists():
+        return cached
+
+    # Synthesize under a per-story name, then move into the shared cache
+    synthesize_chunk(client, text, voice, temp_path)
+    cached.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(temp_path, cached)
+    cached.with_suffix(".json").write_text(json.dumps({
+        "model": TTS_MODEL, "voice": voice, "chars": len(text),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }))
+    return cached
+
+
 def generate_narration(story_name, client, voice=TTS_VOICE):
     story_path = STORIES_DIR / f"{story_name}.md"
     output_path = NARRATIONS_DIR / f"{story_name}.mp3"
 
     if not story_path.exists():
-        print(f"  Story not found: {story_path}")
+        log(f"  Story not found: {story_path}")
         return None
 
-    text = clean_story_text(story_path)
+    _, text = load_story(story_name)
 
     # OpenAI TTS has a ~4096 char limit per request; split into chunks
     max_chars = 4000
-    chunks, current = [], ""
+    chunks, parts, parts_len = [], [], 0
     for paragraph in text.split("\n\n"):
-        if len(current) + len(paragraph) < max_chars:
-            current += paragraph + "\n\n"
+        if parts_len + len(paragraph) < max_chars:
+            parts.append(paragraph)
+            parts_len += len(paragraph) + 2
         else:
-            if current:
-                chunks.append(current.strip())
-            current = paragraph + "\n\n"
-    if current:
-        chunks.append(current.strip())
-
-    print(f"  Generating narration ({voice}, {len(chunks)} chunk(s))...")
-    chunk_files = []
-
-    for i, chunk in enumerate(chunks):
-        if len(chunks) > 1:
-            print(f"    Chunk {i + 1}/{len(chunks)}...")
-        chunk_path = TEMP_DIR / f"{story_name}_chunk{i}.mp3"
-
-        for attempt in range(3):
-            try:
-                response = client.audio.speech.create(
-                    model=TTS_MODEL, voice=voice,
-                    input=chunk, response_format="mp3",
-                )
-                response.stream_to_file(str(chunk_path))
-                chunk_files.append(chunk_path)
-                break
-            except Exception as e:
-                if attempt < 2:
-                    print(f"    Retry {attempt + 1} after: {str(e)[:60]}")
-                    time.sleep(2)
-                else:
-                    raise
-
-        if i < len(chunks) - 1:
-            time.sleep(0.5)
-
-    if len(chunk_files) == 1:
-        os.rename(chunk_files[0], output_path)
-    else:
-        concat_file = TEMP_DIR / f"{story_name}_concat.txt"
-        with open(concat_file, "w") as f:
-            for p in chunk_files:
-                f.write(f"file '{p}'\n")
-        subprocess.run(
-            ["ffmpeg", "-y", "-f", "concat", "-safe", "0",
-             "-i", str(concat_file), "-c", "copy", str(output_path)],
-            check=True, capture_output=True,
-        )
-        concat_file.unlink()
-        for p in chunk_files:
-            p.unlink()
+            if parts:
+                chunks.append("\n\n".join(parts).strip())
+            parts, parts_len = [paragraph], len(paragraph) + 2
+    if parts:
+        chunks.append("\n\n".join(parts).strip())
+
+    log(f"  {story_name}: generating narration ({voice}, {len(chunks)} chunk(s))...")
+
+    # Chunks are independent requests; pacing is left to the RPM limiter.
+    # map() keeps the results in chunk order for the concat below.
+    temp_paths = [TEMP_DIR / f"{story_name}_chunk{i}.mp3" for i in range(len(chunks))]
+    executor = ThreadPoolExecutor(max_workers=TTS_CHUNK_WORKERS)
+    try:
+        chunk_files = list(executor.map(
+            lambda chunk, path: get_chunk_audio(client, chunk, voice, path),
+            chunks, temp_paths,
+        ))
+    finally:
+        # Don't keep synthesizing queued chunks after a failure or Ctrl-C
+        executor.shutdown(cancel_futures=True)
+
+    # Pipe the MP3 chunks through one ffmpeg remux rather than writing a concat
+    # list; ffmpeg also rewrites the Xing header so the full duration is reported.
+    run_ffmpeg(
+        "-f", "mp3", "-i", "pipe:0",
+        "-c", "copy", "-f", "mp3", str(part_path(output_path)),
+        stdin_files=chunk_files,
+    )
 
+    os.replace(part_path(output_path), output_path)
     return output_path
 
 
@@ -165,24 +397,10 @@ def step1_narrations(stories):
     client = get_openai_client()
 
     print(f"\nSTEP 1: Generating narrations  ->  {NARRATIONS_DIR}")
-    ok = fail = 0
-
-    for story in stories:
-        out = NARRATIONS_DIR / f"{story}.mp3"
-        if out.exists():
-            print(f"\n  {story} — exists, skipping")
-            ok += 1
-            continue
-        print(f"\n  {story}")
-        try:
-            if generate_narration(story, client):
-                ok += 1
-            else:
-                fail += 1
-        except Exception as e:
-            print(f"  Error: {e}")
-            fail += 1
-
+    ok, fail = run_stories(
+        lambda story: generate_narration(story, client),
+        stories, NARRATIONS_DIR, ".mp3", API_WORKERS,
+    )
     print(f"\nStep 1 done: {ok} ok, {fail} failed")
 
 
@@ -195,57 +413,38 @@ def mix_audio(story_name):
     output = MIXED_DIR / f"{story_name}.mp3"
 
     if not narration.exists():
-        print(f"  Narration not found: {narration}")
+        log(f"  Narration not found: {narration}")
         return None
     if not BACKGROUND_MUSIC.exists():
-        print(f"  No background music — copying narration as-is")
-        shutil.copy2(narration, output)
+        log(f"  {story_name}: no background music — copying narration as-is")
+        shutil.copy2(narration, part_path(output))
+        os.replace(part_path(output), output)
         return output
 
     duration = get_audio_duration(narration)
-    print(f"  Mixing narration (+{NARRATION_DB}dB) + music ({MUSIC_DB}dB)...")
-
-    subprocess.run(
-        [
-            "ffmpeg", "-y",
-            "-i", str(narration),
-            "-stream_loop", "-1",
-            "-i", str(BACKGROUND_MUSIC),
-            "-filter_complex",
-            f"[0:a]volume={NARRATION_DB}dB[narr];"
-            f"[1:a]volume={MUSIC_DB}dB[music];"
-            f"[narr][music]amix=inputs=2:duration=first:normalize=0[out]",
-            "-map", "[out]",
-            "-t", str(duration),
-            "-c:a", "libmp3lame", "-b:a", "192k",
-            str(output),
-        ],
-        check=True, capture_output=True,
+    log(f"  {story_name}: mixing narration (+{NARRATION_DB}dB) + music ({MUSIC_DB}dB)...")
+
+    run_ffmpeg(
+        "-i", str(narration),
+        "-stream_loop", "-1",
+        "-i", str(BACKGROUND_MUSIC),
+        "-filter_complex",
+        f"[0:a]volume={NARRATION_DB}dB[narr];"
+        f"[1:a]volume={MUSIC_DB}dB[music];"
+        f"[narr][music]amix=inputs=2:duration=first:normalize=0[out]",
+        "-map", "[out]",
+        "-t", str(duration),
+        "-c:a", "libmp3lame", "-q:a", "4",
+        "-f", "mp3", str(part_path(output)),
     )
+    os.replace(part_path(output), output)
     return output
 
 
 def step2_mix(stories):
     MIXED_DIR.mkdir(exist_ok=True)
     print(f"\nSTEP 2: Mixing audio  ->  {MIXED_DIR}")
-    ok = fail = 0
-
-    for story in stories:
-        out = MIXED_DIR / f"{story}.mp3"
-        if out.exists():
-            print(f"\n  {story} — exists, skipping")
-            ok += 1
-            continue
-        print(f"\n  {story}")
-        try:
-            if mix_audio(story):
-                ok += 1
-            else:
-                fail += 1
-        except Exception as e:
-            print(f"  Error: {e}")
-            fail += 1
-
+    ok, fail = run_stories(mix_audio, stories, MIXED_DIR, ".mp3", FFMPEG_WORKERS)
     print(f"\nStep 2 done: {ok} ok, {fail} failed")
 
 
@@ -259,9 +458,9 @@ def ensure_thumbnail(story_name, client):
         return image_path
 
     story_path = STORIES_DIR / f"{story_name}.md"
-    title = extract_story_title(story_path) if story_path.exists() else story_name
+    title = load_story(story_name)[0] if story_path.exists() else story_name
     prompt = f"A fairy tale scene depicting {title}."
-    print(f"  Generating thumbnail via DALL-E 3...")
+    log(f"  {story_name}: generating thumbnail via DALL-E 3...")
     return generate_image(client, story_name, prompt)
 
 
@@ -269,12 +468,10 @@ def step_thumbnails(stories):
     IMAGES_DIR.mkdir(exist_ok=True)
     client = get_openai_client()
     print(f"\nGENERATING THUMBNAILS  ->  {IMAGES_DIR}")
-    for story in stories:
-        print(f"\n  {story}")
-        try:
-            ensure_thumbnail(story, client)
-        except Exception as e:
-            print(f"  Error: {e}")
+    run_stories(
+        lambda story: ensure_thumbnail(story, client),
+        stories, IMAGES_DIR, ".png", API_WORKERS,
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -287,79 +484,139 @@ def create_video(story_name):
     output = OUTPUT_DIR / f"{story_name}.mp4"
 
     if not image.exists():
-        print(f"  Image not found: {image}")
+        log(f"  Image not found: {image}")
         return None
     if not audio.exists():
-        print(f"  Mixed audio not found: {audio}")
+        log(f"  Mixed audio not found: {audio}")
         return None
 
-    duration = get_audio_duration(audio)
-    print(f"  Creating video ({duration:.0f}s)...")
+    log(f"  {story_name}: creating video...")
+
+    run_ffmpeg(
+        *STILL_IMAGE_INPUT,
+        "-i", str(image),
+        "-i", str(audio),
+        *STILL_VIDEO_CODEC,
+        "-c:a", "aac", "-b:a", "192k",
+        "-vf", VIDEO_FILTER,
+        "-shortest",
+        "-f", "mp4", str(part_path(output)),
+    )
+    os.replace(part_path(output), output)
+    return output
 
-    subprocess.run(
-        [
-            "ffmpeg", "-y",
-            "-loop", "1",
-            "-i", str(image),
-            "-i", str(audio),
-            "-c:v", "libx264", "-tune", "stillimage",
-            "-c:a", "aac", "-b:a", "192k",
-            "-pix_fmt", "yuv420p",
-            "-vf", "scale=1920:1080:force_original_aspect_ratio=decrease,"
-                   "pad=1920:1080:(ow-iw)/2:(oh-ih)/2",
-            "-shortest", "-t", str(duration),
-            str(output),
-        ],
-        check=True, capture_output=True,
+
+def create_video_fused(story_name):
+    """Mix narration with music and render the video in one ffmpeg pass.
+
+    Equivalent to mix_audio + create_video without the intermediate MP3
+    encode/decode round trip.
+    """
+    image = IMAGES_DIR / f"{story_name}.png"
+    narration = NARRATIONS_DIR / f"{story_name}.mp3"
+    output = OUTPUT_DIR / f"{story_name}.mp4"
+
+    if not image.exists():
+        log(f"  Image not found: {image}")
+        return None
+    if not narration.exists():
+        log(f"  Narration not found: {narration}")
+        return None
+
+    if BACKGROUND_MUSIC.exists():
+        music_input = ["-stream_loop", "-1", "-i", str(BACKGROUND_MUSIC)]
+        audio_graph = (
+            f"[1:a]volume={NARRATION_DB}dB[narr];"
+            f"[2:a]volume={MUSIC_DB}dB[music];"
+            f"[narr][music]amix=inputs=2:duration=first:normalize=0[a]"
+        )
+    else:
+        music_input = []
+        audio_graph = "[1:a]anull[a]"
+
+    log(f"  {story_name}: mixing + creating video...")
+
+    run_ffmpeg(
+        *STILL_IMAGE_INPUT,
+        "-i", str(image),
+        "-i", str(narration),
+        *music_input,
+        "-filter_complex", f"[0:v]{VIDEO_FILTER}[v];{audio_graph}",
+        "-map", "[v]", "-map", "[a]",
+        *STILL_VIDEO_CODEC,
+        "-c:a", "aac", "-b:a", "192k",
+        "-shortest",
+        "-f", "mp4", str(part_path(output)),
     )
+    os.replace(part_path(output), output)
     return output
 
 
 def step3_videos(stories):
     OUTPUT_DIR.mkdir(exist_ok=True)
     print(f"\nSTEP 3: Creating videos  ->  {OUTPUT_DIR}")
-    ok = fail = 0
+    ok, fail = run_stories(create_video, stories, OUTPUT_DIR, ".mp4", FFMPEG_WORKERS)
+    print(f"\nStep 3 done: {ok} ok, {fail} failed")
 
-    for story in stories:
-        out = OUTPUT_DIR / f"{story}.mp4"
-        if out.exists():
-            print(f"\n  {story} — exists, skipping")
-            ok += 1
-            continue
-        print(f"\n  {story}")
-        try:
-            if create_video(story):
-                ok += 1
-            else:
-                fail += 1
-        except Exception as e:
-            print(f"  Error: {e}")
-            fail += 1
 
-    print(f"\nStep 3 done: {ok} ok, {fail} failed")
+# ---------------------------------------------------------------------------
+# Full pipeline: chain every step per story
+# ---------------------------------------------------------------------------
+
+def run_story(story_name, client, keep_intermediate=False):
+    """Narrate, mix, illustrate and render one story, skipping finished steps.
+
+    ffmpeg steps wait for a free slot so that many concurrent stories can
+    overlap their API calls without oversubscribing the CPU.
+    """
+    if not (NARRATIONS_DIR / f"{story_name}.mp3").exists():
+        if not generate_narration(story_name, client):
+            return None
+    ensure_thumbnail(story_name, client)
+    if not keep_intermediate:
+        with _ffmpeg_slots:
+            return create_video_fused(story_name)
+
+    if not (MIXED_DIR / f"{story_name}.mp3").exists():
+        with _ffmpeg_slots:
+            if not mix_audio(story_name):
+                return None
+    with _ffmpeg_slots:
+        return create_video(story_name)
+
+
+def run_all(stories, keep_intermediate=False):
+    client = get_openai_client()
+    print(f"\nRunning all steps per story  ->  {OUTPUT_DIR}")
+    ok, fail = run_stories(
+        lambda story: run_story(story, client, keep_intermediate),
+        stories, OUTPUT_DIR, ".mp4", API_WORKERS,
+    )
+    print(f"\nAll steps done: {ok} ok, {fail} failed")
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-def list_stories():
-    stories = sorted(p.stem for p in STORIES_DIR.glob("*.md"))
+def list_stories(stories):
     print(f"Available stories ({len(stories)}):")
     for i, s in enumerate(stories, 1):
         print(f"  {i:3}. {s}")
-    return stories
 
 
-def show_status():
-    stories = sorted(p.stem for p in STORIES_DIR.glob("*.md"))
+def show_status(stories):
     print(f"\n{'Story':<30} {'Image':<12} {'Narration':<12} {'Mixed':<12} {'Video':<12}")
     print("-" * 78)
+    images = existing_stems(IMAGES_DIR, ".png")
+    narrations = existing_stems(NARRATIONS_DIR, ".mp3")
+    mixed = existing_stems(MIXED_DIR, ".mp3")
+    videos = existing_stems(OUTPUT_DIR, ".mp4")
     for s in stories:
-        img  = "yes" if (IMAGES_DIR / f"{s}.png").exists() else "-"
-        narr = "yes" if (NARRATIONS_DIR / f"{s}.mp3").exists() else "-"
-        mix_ = "yes" if (MIXED_DIR / f"{s}.mp3").exists() else "-"
-        vid  = "yes" if (OUTPUT_DIR / f"{s}.mp4").exists() else "-"
+        img  = "yes" if s in images else "-"
+        narr = "yes" if s in narrations else "-"
+        mix_ = "yes" if s in mixed else "-"
+        vid  = "yes" if s in videos else "-"
         print(f"{s:<30} {img:<12} {narr:<12} {mix_:<12} {vid:<12}")
 
 
@@ -367,18 +624,21 @@ def main():
     for d in [IMAGES_DIR, NARRATIONS_DIR, MIXED_DIR, OUTPUT_DIR, TEMP_DIR]:
         d.mkdir(exist_ok=True)
 
+    # Scan the stories directory once and hand the list to every command
+    all_stories = sorted(existing_stems(STORIES_DIR, ".md"))
+
     if len(sys.argv) < 2:
         print(__doc__)
-        list_stories()
+        list_stories(all_stories)
         return
 
     arg = sys.argv[1]
 
     if arg == "--list":
-        list_stories()
+        list_stories(all_stories)
         return
     if arg == "--status":
-        show_status()
+        show_status(all_stories)
         return
 
     # Determine stories to process
@@ -386,10 +646,13 @@ def main():
         if len(sys.argv) > 2 and not sys.argv[2].startswith("--"):
             stories = [sys.argv[2]]
         else:
-            stories = sorted(p.stem for p in STORIES_DIR.glob("*.md"))
+            stories = all_stories
     else:
         stories = [arg]
 
+    if arg in ("--step1", "--step2", "--step3", "--all") or not arg.startswith("--"):
+        remove_partial_outputs()
+
     if arg == "--step1":
         step1_narrations(stories)
     elif arg == "--step2":
@@ -398,13 +661,10 @@ def main():
         step3_videos(stories)
     elif arg == "--all" or not arg.startswith("--"):
         print(f"Running full pipeline for {len(stories)} story(s)...")
-        step1_narrations(stories)
-        step2_mix(stories)
-        step_thumbnails(stories)
-        step3_videos(stories)
+        run_all(stories, keep_intermediate="--keep-intermediate" in sys.argv)
         print("\n" + "=" * 50)
         print("Pipeline complete!")
-        show_status()
+        show_status(all_stories)
 
     if TEMP_DIR.exists() and not any(TEMP_DIR.iterdir()):
         TEMP_DIR.rmdir()
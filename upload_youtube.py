@@ -19,6 +19,8 @@ import os
 import re
 import sys
 import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
@@ -42,8 +44,14 @@ DEFAULT_PRIVACY = "public"
 DEFAULT_LANGUAGE = "zh"
 DEFAULT_AUDIO_LANGUAGE = "zh-Hans"
 
+# Files up to this size are sent in a single request (chunksize=-1); larger
+# ones fall back to 8 MiB chunks so a dropped connection resends less.
+SINGLE_REQUEST_MAX_BYTES = 512 * 1024 * 1024
+UPLOAD_CHUNK_BYTES = 8 * 1024 * 1024
+UPLOAD_WORKERS = 3
 
-def get_authenticated_service():
+
+def get_credentials():
     credentials = None
 
     if TOKEN_FILE.exists():
@@ -66,10 +74,20 @@ def get_authenticated_service():
         with open(TOKEN_FILE, "wb") as f:
             pickle.dump(credentials, f)
 
-    return build("youtube", "v3", credentials=credentials)
+    return credentials
+
+
+def get_authenticated_service(credentials=None):
+    # Bundled discovery document (already the default in google-api-python-client
+    # 2.x); spelled out so build() never falls back to a fetch or file cache
+    return build(
+        "youtube", "v3", credentials=credentials or get_credentials(),
+        static_discovery=True, cache_discovery=False,
+    )
 
 
-def upload_video(youtube, video_path, privacy=DEFAULT_PRIVACY, playlist_id=None, publish_at=None):
+def upload_video(youtube, video_path, privacy=DEFAULT_PRIVACY, playlist_id=None, publish_at=None,
+                 progress=True):
     video_path = Path(video_path)
     story_name = video_path.stem
 
@@ -77,7 +95,8 @@ def upload_video(youtube, video_path, privacy=DEFAULT_PRIVACY, playlist_id=None,
     display_name = re.sub(r"^\d+[-_]", "", story_name)
 
     title = f"{display_name}"
-    print(f"\n  Uploading: {title}")
+    if progress:
+        print(f"\n  Uploading: {title}")
 
     body = {
         "snippet": {
@@ -98,27 +117,30 @@ def upload_video(youtube, video_path, privacy=DEFAULT_PRIVACY, playlist_id=None,
     if publish_at:
         body["status"]["publishAt"] = publish_at.isoformat().replace("+00:00", "Z")
 
-    media = MediaFileUpload(str(video_path), mimetype="video/mp4", resumable=True, chunksize=1024 * 1024)
+    size = video_path.stat().st_size
+    chunksize = -1 if size <= SINGLE_REQUEST_MAX_BYTES else UPLOAD_CHUNK_BYTES
+    media = MediaFileUpload(str(video_path), mimetype="video/mp4", resumable=True, chunksize=chunksize)
 
     try:
         request = youtube.videos().insert(part="snippet,status", body=body, media_body=media)
         response = None
-        print("  Uploading", end="", flush=True)
+        if progress:
+            print("  Uploading", end="", flush=True)
         while response is None:
             status, response = request.next_chunk()
-            if status:
+            if status and progress:
                 print(f"\r  Uploading: {int(status.progress() * 100)}%", end="", flush=True)
 
         video_id = response["id"]
         url = f"https://youtu.be/{video_id}"
-        print(f"\r  Done: {url}")
+        print(f"\r  Done: {url}" if progress else f"  Done: {title}  {url}")
 
         if playlist_id:
             add_to_playlist(youtube, video_id, playlist_id)
 
         return {"success": True, "video_id": video_id, "url": url, "title": title}
     except HttpError as e:
-        print(f"\r  Upload failed: {e.reason}")
+        print(f"\r  Upload failed: {e.reason}" if progress else f"  Upload failed: {title}: {e.reason}")
         return {"success": False, "error": str(e)}
 
 
@@ -164,7 +186,8 @@ def main():
         print("Authentication OK")
         return
 
-    youtube = get_authenticated_service()
+    credentials = get_credentials()
+    youtube = get_authenticated_service(credentials)
 
     if arg == "--playlists":
         list_playlists(youtube)
@@ -204,7 +227,32 @@ def main():
         start = datetime.now(tz).replace(hour=9, minute=0, second=0, microsecond=0) + timedelta(days=1)
         publish_times = [start + timedelta(days=i) for i in range(len(videos))]
 
-    results = [upload_video(youtube, v, privacy, playlist_id, pt) for v, pt in zip(videos, publish_times)]
+    if len(videos) == 1:
+        results = [upload_video(youtube, videos[0], privacy, playlist_id, publish_times[0])]
+    else:
+        # googleapiclient services are not thread-safe: give each worker its own
+        local = threading.local()
+
+        def upload(video, publish_at):
+            if not hasattr(local, "youtube"):
+                local.youtube = get_authenticated_service(credentials)
+            return upload_video(local.youtube, video, privacy, None, publish_at, progress=False)
+
+        print(f"Uploading {len(videos)} videos ({UPLOAD_WORKERS} at a time)...")
+        executor = ThreadPoolExecutor(max_workers=UPLOAD_WORKERS)
+        try:
+            results = list(executor.map(upload, videos, publish_times))
+        finally:
+            # On Ctrl-C, don't start the uploads still waiting in the queue
+            executor.shutdown(cancel_futures=True)
+
+        # Playlist inserts run afterwards, in video order, so the playlist
+        # order doesn't depend on which upload happened to finish first
+        if playlist_id:
+            for r in results:
+                if r.get("success"):
+                    add_to_playlist(youtube, r["video_id"], playlist_id)
+
     ok = sum(1 for r in results if r.get("success"))
     print(f"\nDone: {ok}/{len(results)} uploaded")
 